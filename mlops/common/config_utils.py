@@ -1,10 +1,30 @@
 """Configuration utils to load config from yaml/json."""
+import json
 import os
-from typing import Dict, Any
+import re
+from typing import Dict, Any, FrozenSet, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Matches the $name and ${name} forms substituted by os.path.expandvars.
+_ENV_VAR_PATTERN = re.compile(r"\$(\w+|\{[^}]*\})")
+
+# Parsed configurations and the environment variables they reference,
+# keyed by (absolute path, modification time).
+_CONFIG_CACHE: Dict[Tuple[str, float], Tuple[Any, FrozenSet[str]]] = {}
+
+# Env-expanded configurations keyed by (absolute path, modification time, referenced env values).
+_EXPANDED_CONFIG_CACHE: Dict[Tuple, Any] = {}
+
+# The .env file is read into os.environ once per process.
+_DOTENV_LOADED = False
+
 
 class MLOpsConfig:
     """MLopsConfig Class."""
@@ -14,15 +34,23 @@ class MLOpsConfig:
     def __init__(
         self, environment: str = "pr", config_path: Path = "config/config.yaml"
     ):
-        """Intialize MLConfig with yaml config data."""
+        """Intialize MLConfig, the yaml config data is loaded on first access."""
+        global _DOTENV_LOADED
+
         self.config_path = config_path
         self._environment = environment
-        load_dotenv()
-        with open(config_path, "r", encoding="utf-8") as stream:
-            self._raw_config = yaml.safe_load(os.path.expandvars(stream.read()))
+        self._raw_config = None
+        if not _DOTENV_LOADED:
+            load_dotenv()
+            _DOTENV_LOADED = True
 
     def __getattr__(self, __name: str) -> Any:
         """Get values for top level keys in configuration."""
+        if __name.startswith("_"):
+            # Internal attributes are never config keys; avoids recursion before __init__ ran.
+            raise AttributeError(__name)
+        if self._raw_config is None:
+            self._raw_config = _load_config(self.config_path)
         return self._raw_config[__name]
 
     def get_pipeline_config(self, pipeline_name: str) -> Dict:
@@ -39,5 +67,90 @@ class MLOpsConfig:
             return self.deployment_configs[deploymentconfig_name]
 
 
+def _load_config(config_path: Path) -> Any:
+    """
+    Return the env-expanded config, parsing and expanding only when something changed.
+
+    The parsed file is reused until its modification time changes and the expanded
+    result is reused while the environment variables referenced by the file keep their values.
+    """
+    key = (os.path.abspath(config_path), os.path.getmtime(config_path))
+    if key not in _CONFIG_CACHE:
+        raw_config = _parse_config(config_path)
+        _CONFIG_CACHE[key] = (raw_config, _find_env_vars(raw_config))
+    raw_config, env_var_names = _CONFIG_CACHE[key]
+
+    env_key = key + (tuple((name, os.environ.get(name)) for name in sorted(env_var_names)),)
+    if not env_var_names:
+        return raw_config
+    if env_key not in _EXPANDED_CONFIG_CACHE:
+        _EXPANDED_CONFIG_CACHE[env_key] = _expand_env_vars(raw_config)
+    return _EXPANDED_CONFIG_CACHE[env_key]
+
+
+def _parse_config(config_path: Path) -> Any:
+    """
+    Parse a yaml config file without substituting environment variables.
+
+    The parsed content is also written to a json file next to the yaml file, so
+    subsequent processes can skip yaml parsing while the yaml file is unchanged.
+    """
+    json_path = Path(config_path).with_suffix(".json")
+    if json_path.exists() and os.path.getmtime(json_path) >= os.path.getmtime(config_path):
+        try:
+            return json.loads(json_path.read_text(encoding="utf-8"))
+        except ValueError as ex:
+            # A damaged cache is ignored and rewritten from the yaml file below
+            print(f"Could not read config cache {json_path}: {ex}")
+
+    with open(config_path, "rb") as stream:
+        raw_config = yaml.load(stream, Loader=_YamlLoader)
+    # Write to a temporary file and rename it, so readers never see a partially written cache
+    tmp_path = json_path.with_name(f"{json_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(raw_config), encoding="utf-8")
+        os.replace(tmp_path, json_path)
+    except (OSError, TypeError) as ex:
+        print(f"Could not write config cache {json_path}: {ex}")
+        tmp_path.unlink(missing_ok=True)
+    return raw_config
+
+
+def _find_env_vars(node: Any) -> FrozenSet[str]:
+    """Collect the names of environment variables referenced in string values of the parsed config."""
+    if isinstance(node, dict):
+        return frozenset().union(*(_find_env_vars(value) for value in node.values()))
+    if isinstance(node, list):
+        return frozenset().union(*(_find_env_vars(value) for value in node))
+    if isinstance(node, str) and "$" in node:
+        return frozenset(match.strip("{}") for match in _ENV_VAR_PATTERN.findall(node))
+    return frozenset()
+
+
+def _expand_env_vars(node: Any) -> Any:
+    """Substitute environment variables in all string values of the parsed config."""
+    if isinstance(node, dict):
+        return {key: _expand_env_vars(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_expand_env_vars(value) for value in node]
+    if isinstance(node, str) and "$" in node:
+        return _type_scalar(os.path.expandvars(node))
+    return node
+
+
+def _type_scalar(value: str) -> Any:
+    """
+    Return the yaml typed value of an expanded string, as if it had been substituted before parsing.
+
+    A numeric build id is an int and an empty value is None, like when the text was expanded
+    before yaml parsing. Values that would not parse into a single scalar stay strings.
+    """
+    try:
+        typed = yaml.load(value, Loader=_YamlLoader)
+    except yaml.YAMLError:
+        return value
+    return value if isinstance(typed, (dict, list)) else typed
+
+
 if __name__ == "__main__":
     mlconfig = MLOpsConfig()
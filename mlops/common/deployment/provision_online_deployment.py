@@ -4,6 +4,7 @@ This script automates the deployment of machine learning models in Azure Machine
 It supports real-time deployment scenarios.
 """
 import argparse
+from itertools import islice
 import time
 from azure.ai.ml import MLClient
 from azure.ai.ml.entities import (
@@ -12,36 +13,13 @@ from azure.ai.ml.entities import (
     CodeConfiguration,
 )
 from azure.identity import DefaultAzureCredential
-from azure.core.exceptions import ResourceExistsError
+from azure.core.exceptions import ResourceNotFoundError
 from mlops.common.config_utils import MLOpsConfig
 from mlops.common.naming_utils import generate_model_name
+from mlops.common.endpoint_utils import wait_for_endpoint_ready, begin_with_retry
 
-
-def wait_for_endpoint_ready(ml_client, endpoint_name, max_wait=600):
-    """Wait for endpoint to be ready for operations."""
-    print(f"Checking if endpoint {endpoint_name} is ready for operations...")
-    start_time = time.time()
-
-    while time.time() - start_time < max_wait:
-        try:
-            endpoint = ml_client.online_endpoints.get(endpoint_name)
-            print(f"Endpoint state: {endpoint.provisioning_state}")
-
-            if endpoint.provisioning_state == "Succeeded":
-                print(f"Endpoint {endpoint_name} is ready")
-                return True
-            elif endpoint.provisioning_state in ["Failed", "Canceled"]:
-                raise Exception(f"Endpoint in {endpoint.provisioning_state} state")
-            else:
-                print(f"Endpoint still provisioning ({endpoint.provisioning_state}). Waiting 30 seconds...")
-                time.sleep(30)
-        except Exception as e:
-            if "not found" in str(e).lower() or "ResourceNotFound" in str(e):
-                print(f"Endpoint {endpoint_name} does not exist yet - ready to create")
-                return True
-            raise
-
-    raise TimeoutError(f"Endpoint not ready after {max_wait} seconds")
+# Number of workspace models printed when the requested model does not exist.
+MAX_LISTED_MODELS = 20
 
 
 def wait_for_deployment_ready(ml_client, endpoint_name, deployment_name, max_wait=900, poll_interval=30):
@@ -87,46 +65,6 @@ def wait_for_deployment_ready(ml_client, endpoint_name, deployment_name, max_wai
     )
 
 
-def deploy_with_retry(
-    ml_client,
-    deployment,
-    max_retries=3,
-    initial_delay=60,
-    wait_if_conflict=None,
-):
-    """Deploy with retry logic for concurrent operation conflicts."""
-    for attempt in range(max_retries):
-        try:
-            print(f"Deployment attempt {attempt + 1}/{max_retries}...")
-            poller = ml_client.begin_create_or_update(deployment)
-            result = poller.result()
-            print("Deployment completed successfully")
-            return result
-        except ResourceExistsError as e:
-            message = str(e)
-            if "Already running method" in message and attempt < max_retries - 1:
-                print("Conflict detected: Another operation is in progress.")
-                if wait_if_conflict:
-                    print(
-                        "Waiting for existing deployment operation to finish before retrying..."
-                    )
-                    wait_if_conflict()
-                else:
-                    delay = initial_delay * (2 ** attempt)  # Exponential backoff
-                    print(
-                        f"Waiting {delay} seconds before retry {attempt + 2}/{max_retries}..."
-                    )
-                    time.sleep(delay)
-            else:
-                print(f"Deployment failed after {attempt + 1} attempts")
-                raise
-        except Exception as e:
-            print(f"Unexpected error during deployment: {str(e)}")
-            raise
-
-    raise Exception("Deployment failed after all retry attempts")
-
-
 def main():
     """Automate the deployment of machine learning models in Azure Machine Learning."""
     parser = argparse.ArgumentParser("provision_deployment")
@@ -164,22 +102,17 @@ def main():
     print(f"Looking for model: {published_model_name}")
 
     try:
-        model_refs = ml_client.models.list(published_model_name)
-        model_list = list(model_refs)
-
-        if not model_list:
-            print(f"ERROR: No models found with name '{published_model_name}'")
-            print("Available models:")
-            for model in ml_client.models.list():
-                print(f"  - {model.name} (version {model.version})")
-            raise ValueError(
-                f"Model '{published_model_name}' not found. "
-                "Please check model name and ensure training completed successfully."
-            )
-
-        latest_version = max(model.version for model in model_list)
-        print(f"Found model version: {latest_version}")
-        model = ml_client.models.get(published_model_name, latest_version)
+        model = ml_client.models.get(name=published_model_name, label="latest")
+        print(f"Found model version: {model.version}")
+    except ResourceNotFoundError as e:
+        print(f"ERROR: No models found with name '{published_model_name}'")
+        print(f"Available models (first {MAX_LISTED_MODELS}):")
+        for available_model in islice(ml_client.models.list(), MAX_LISTED_MODELS):
+            print(f"  - {available_model.name} (version {available_model.version})")
+        raise ValueError(
+            f"Model '{published_model_name}' not found. "
+            "Please check model name and ensure training completed successfully."
+        ) from e
     except Exception as e:
         print(f"Error retrieving model '{published_model_name}': {str(e)}")
         raise
@@ -208,7 +141,7 @@ def main():
     )
 
     # Wait for endpoint and deployment to be idle before deploying
-    wait_for_endpoint_ready(ml_client, deployment_config["endpoint_name"])
+    wait_for_endpoint_ready(ml_client.online_endpoints, deployment_config["endpoint_name"])
     wait_for_deployment_ready(
         ml_client,
         deployment_config["endpoint_name"],
@@ -216,9 +149,8 @@ def main():
     )
 
     # Deploy with retry logic
-    deploy_with_retry(
-        ml_client,
-        blue_deployment,
+    begin_with_retry(
+        lambda: ml_client.begin_create_or_update(blue_deployment),
         wait_if_conflict=lambda: wait_for_deployment_ready(
             ml_client,
             deployment_config["endpoint_name"],
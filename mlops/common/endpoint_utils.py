@@ -0,0 +1,135 @@
+"""
+This module provides helpers shared by the endpoint and deployment provisioning scripts.
+
+It includes polling for an endpoint to become ready for operations and retrying long running
+create or update operations that conflict with another operation in progress on the same resource.
+"""
+import time
+from azure.core.exceptions import ResourceExistsError
+from tenacity import (
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+    wait_none,
+    wait_random,
+)
+
+
+def wait_for_endpoint_ready(
+    endpoint_operations,
+    endpoint_name,
+    max_wait=600,
+    initial_delay=2,
+    max_delay=30,
+    backoff=1.5,
+):
+    """
+    Wait for endpoint to be ready for operations, polling with exponential backoff.
+
+    Parameters:
+      endpoint_operations: endpoint operations of the ml client (batch_endpoints or online_endpoints)
+      endpoint_name (str): name of the endpoint
+      max_wait (int): maximum number of seconds to wait
+      initial_delay (float): seconds to wait before the second poll
+      max_delay (float): upper bound of seconds between two polls
+      backoff (float): factor to grow the delay by after every poll
+
+    Returns:
+        bool: True when the endpoint is ready or does not exist yet
+    """
+    print(f"Checking if endpoint {endpoint_name} is ready for operations...")
+    start_time = time.time()
+    attempt = 0
+
+    while time.time() - start_time < max_wait:
+        try:
+            endpoint = endpoint_operations.get(endpoint_name)
+            print(f"Endpoint state: {endpoint.provisioning_state}")
+
+            if endpoint.provisioning_state == "Succeeded":
+                print(f"Endpoint {endpoint_name} is ready")
+                return True
+            elif endpoint.provisioning_state in ["Failed", "Canceled"]:
+                raise Exception(f"Endpoint in {endpoint.provisioning_state} state")
+            else:
+                delay = min(max_delay, initial_delay * backoff ** attempt)
+                print(f"Endpoint still provisioning ({endpoint.provisioning_state}). Waiting {delay:.0f} seconds...")
+                time.sleep(delay)
+                attempt += 1
+        except Exception as e:
+            if "not found" in str(e).lower() or "ResourceNotFound" in str(e):
+                print(f"Endpoint {endpoint_name} does not exist yet - ready to create")
+                return True
+            raise
+
+    raise TimeoutError(f"Endpoint not ready after {max_wait} seconds")
+
+
+def begin_with_retry(
+    begin_operation,
+    operation_name="Deployment",
+    max_retries=3,
+    initial_delay=60,
+    max_delay=480,
+    conflict_markers=("already running method",),
+    wait_if_conflict=None,
+):
+    """
+    Run a long running operation with retry logic for concurrent operation conflicts.
+
+    Parameters:
+      begin_operation (callable): starts the operation and returns its poller
+      operation_name (str): name of the operation used in log messages
+      max_retries (int): maximum number of attempts
+      initial_delay (float): seconds to wait before the first retry, doubled for every next one
+      max_delay (float): upper bound of seconds to wait between two attempts
+      conflict_markers (tuple): lower case fragments of an error message that indicate a conflict
+      wait_if_conflict (callable): waits for the conflicting operation instead of a fixed delay
+
+    Returns:
+        The result of the operation poller
+    """
+
+    def is_conflict(ex):
+        message = str(ex).lower()
+        return isinstance(ex, ResourceExistsError) and any(marker in message for marker in conflict_markers)
+
+    def before_sleep(retry_state):
+        print("Conflict detected: Another operation is in progress.")
+        if wait_if_conflict:
+            print("Waiting for existing operation to finish before retrying...")
+            wait_if_conflict()
+        else:
+            print(
+                f"Waiting {retry_state.next_action.sleep:.0f} seconds before retry "
+                f"{retry_state.attempt_number + 1}/{max_retries}..."
+            )
+
+    retrying = Retrying(
+        reraise=True,
+        stop=stop_after_attempt(max_retries),
+        # Jitter keeps parallel deployments that collided from retrying in lockstep.
+        wait=(
+            wait_none()
+            if wait_if_conflict
+            else wait_exponential(multiplier=initial_delay, max=max_delay) + wait_random(0, 10)
+        ),
+        retry=retry_if_exception(is_conflict),
+        before_sleep=before_sleep,
+    )
+
+    try:
+        for attempt in retrying:
+            with attempt:
+                print(f"{operation_name} attempt {attempt.retry_state.attempt_number}/{max_retries}...")
+                result = begin_operation().result()
+    except ResourceExistsError:
+        print(f"{operation_name} failed after {retrying.statistics['attempt_number']} attempts")
+        raise
+    except Exception as e:
+        print(f"Unexpected error during {operation_name.lower()}: {str(e)}")
+        raise
+
+    print(f"{operation_name} completed successfully")
+    return result
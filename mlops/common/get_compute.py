@@ -10,76 +10,191 @@ arguments for specifying the details of the Azure Machine Learning compute targe
 from azure.identity import DefaultAzureCredential
 from azure.ai.ml import MLClient
 from azure.ai.ml.entities import AmlCompute, IdentityConfiguration
-import subprocess
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+from azure.mgmt.authorization import AuthorizationManagementClient
+from azure.mgmt.authorization.models import RoleAssignmentCreateParameters
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
-import json
+import uuid
 
+# Credential shared by the clients created in this module, see _get_credential.
+_credential = None
 
-def _check_role_assignment(principal_id, scope, role_name):
-    """Check if the principal has the specified role on the given scope."""
+
+def _get_credential():
+    """Return a process wide DefaultAzureCredential so auth sources are probed only once."""
+    global _credential
+    if _credential is None:
+        _credential = DefaultAzureCredential()
+    return _credential
+
+
+# Role definition ids resolved so far, keyed by (scope, role name).
+_role_definition_ids = {}
+
+
+def _get_role_definition_id(auth_client, scope, role_name):
+    """Return the full resource id of a built-in role definition by its name."""
+    key = (scope, role_name)
+    if key not in _role_definition_ids:
+        role_definitions = auth_client.role_definitions.list(
+            scope, filter=f"roleName eq '{role_name}'"
+        )
+        role_definition = next(iter(role_definitions), None)
+        if role_definition is None:
+            raise ValueError(f"Role definition '{role_name}' not found for scope {scope}")
+        _role_definition_ids[key] = role_definition.id
+    return _role_definition_ids[key]
+
+
+def _role_guid(role_definition_id):
+    """Return the role GUID, role definition ids differ in their scope prefix only."""
+    return role_definition_id.split("/")[-1].lower()
+
+
+def _fetch_assigned_roles(auth_client, principal_id, scope):
+    """Return the GUIDs of all roles the principal holds on the given scope in a single call."""
     try:
-        cmd = [
-            "az",
-            "role",
-            "assignment",
-            "list",
-            "--assignee",
-            principal_id,
-            "--scope",
-            scope,
-            "--role",
-            role_name,
-            "--output",
-            "json",
-        ]
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        assignments = json.loads(result.stdout)
-        return len(assignments) > 0
+        assignments = auth_client.role_assignments.list_for_scope(
+            scope, filter=f"principalId eq '{principal_id}'"
+        )
+        return {_role_guid(assignment.role_definition_id) for assignment in assignments}
     except Exception as e:
         print(f"Warning: Could not check role assignment: {e}")
-        return False
+        return set()
+
+
+def _check_role_assignment(auth_client, principal_id, scope, role_definition_id):
+    """Check if the principal has the specified role on the given scope."""
+    return _role_guid(role_definition_id) in _fetch_assigned_roles(auth_client, principal_id, scope)
 
 
-def _ensure_role_assignment(principal_id, role_name, scope, wait_seconds=120):
-    """Ensure the principal holds the specified role, assigning if necessary."""
+# (principal id, scope, role GUID) of role assignments known to exist, so repeated
+# get_compute calls in one process do not query ARM for them again.
+_confirmed_role_assignments = set()
+
+
+# Maximum time given to Azure RBAC to propagate newly created role assignments.
+RBAC_PROPAGATION_SECONDS = 120
+# Polling starts with a short interval that grows up to the maximum, since
+# propagation usually completes within seconds.
+RBAC_POLL_INTERVAL_SECONDS = 2
+RBAC_MAX_POLL_INTERVAL_SECONDS = 15
+# Polling only shows that ARM lists the assignment, the storage data plane can still
+# reject the identity for a while, so a new assignment is always given this long.
+RBAC_MIN_PROPAGATION_SECONDS = 30
+
+
+def _wait_for_role_assignment(
+    auth_client,
+    principal_id,
+    scope,
+    role_definition_id,
+    max_wait=RBAC_PROPAGATION_SECONDS,
+    poll_interval=RBAC_POLL_INTERVAL_SECONDS,
+    min_wait=0,
+):
+    """
+    Poll with a growing interval until the role assignment is visible or max_wait seconds have passed.
+
+    Visibility is checked through the ARM role assignment listing, which only confirms that the
+    assignment exists. It does not prove that data plane access is already granted, min_wait
+    keeps waiting for at least that many seconds after an assignment became visible.
+    """
+    print(f"Waiting up to {max_wait} seconds for RBAC propagation...")
+    start_time = time.monotonic()
+    deadline = start_time + max_wait
+    while time.monotonic() < deadline:
+        if _check_role_assignment(auth_client, principal_id, scope, role_definition_id):
+            print(f"Role assignment visible after {time.monotonic() - start_time:.0f} seconds.")
+            remaining = start_time + min_wait - time.monotonic()
+            if remaining > 0:
+                print(f"Waiting {remaining:.0f} more seconds for data plane propagation...")
+                time.sleep(remaining)
+            return True
+        time.sleep(min(poll_interval, max(0, deadline - time.monotonic())))
+        poll_interval = min(poll_interval * 1.5, RBAC_MAX_POLL_INTERVAL_SECONDS)
+    print(f"WARNING: Role assignment not confirmed after {max_wait} seconds.")
+    return False
+
+
+def _ensure_role_assignment(
+    auth_client,
+    principal_id,
+    role_name,
+    scope,
+    assigned_roles=None,
+    wait_seconds=RBAC_PROPAGATION_SECONDS,
+):
+    """
+    Ensure the principal holds the specified role, assigning if necessary.
+
+    Parameters:
+      assigned_roles (set): role GUIDs already held on the scope, fetched when not provided
+
+    Returns:
+        bool: True if a new role assignment has been created.
+    """
     print(f"Assigning '{role_name}' role to principal {principal_id}")
     print(f"Scope: {scope}")
 
-    if _check_role_assignment(principal_id, scope, role_name):
+    role_definition_id = _get_role_definition_id(auth_client, scope, role_name)
+
+    if assigned_roles is None:
+        assigned_roles = _fetch_assigned_roles(auth_client, principal_id, scope)
+
+    confirmed_key = (principal_id, scope, _role_guid(role_definition_id))
+    if confirmed_key in _confirmed_role_assignments or confirmed_key[2] in assigned_roles:
         print(f"{role_name} assignment already exists and is confirmed.")
-        return
-
-    cmd = [
-        "az",
-        "role",
-        "assignment",
-        "create",
-        "--assignee",
-        principal_id,
-        "--role",
-        role_name,
-        "--scope",
-        scope,
-    ]
+        _confirmed_role_assignments.add(confirmed_key)
+        return False
+
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        auth_client.role_assignments.create(
+            scope,
+            str(uuid.uuid4()),
+            RoleAssignmentCreateParameters(
+                role_definition_id=role_definition_id,
+                principal_id=principal_id,
+                principal_type="ServicePrincipal",
+            ),
+        )
         print(f"{role_name} assignment successful.")
-        if result.stdout:
-            print(result.stdout)
         if wait_seconds:
-            print(f"Waiting {wait_seconds} seconds for RBAC propagation...")
-            time.sleep(wait_seconds)
-    except subprocess.CalledProcessError as e:
-        if "RoleAssignmentExists" in e.stderr:
+            _wait_for_role_assignment(
+                auth_client,
+                principal_id,
+                scope,
+                role_definition_id,
+                max_wait=wait_seconds,
+                min_wait=min(RBAC_MIN_PROPAGATION_SECONDS, wait_seconds),
+            )
+        _confirmed_role_assignments.add(confirmed_key)
+        return True
+    except HttpResponseError as e:
+        if isinstance(e, ResourceExistsError) or "RoleAssignmentExists" in str(e):
             print(f"{role_name} assignment already exists - this is OK.")
             if wait_seconds:
-                print("Waiting 30 seconds to ensure RBAC is fully propagated...")
-                time.sleep(30)
+                _wait_for_role_assignment(
+                    auth_client, principal_id, scope, role_definition_id, max_wait=wait_seconds
+                )
+            _confirmed_role_assignments.add(confirmed_key)
+            return False
         else:
-            raise Exception(f"Failed to assign {role_name} role: {e.stderr}")
+            raise Exception(f"Failed to assign {role_name} role: {e.message}")
+
 
+# Roles the compute identity needs on the workspace storage account for batch orchestration.
+STORAGE_ROLES = (
+    "Storage Blob Data Contributor",
+    "Storage Table Data Contributor",
+    "Storage Queue Data Contributor",
+)
+# AzureML Data Scientist role is assigned on the workspace for model access.
+WORKSPACE_ROLES = ("AzureML Data Scientist",)
 
-def _assign_storage_role(client, workspace_name, compute_object):
+
+def _assign_storage_role(auth_client, storage_scope, workspace_id, compute_object):
     """Assign Storage Blob Data Contributor role to the compute identity."""
     if not (compute_object.identity and compute_object.identity.principal_id):
         error_msg = (
@@ -91,26 +206,42 @@ def _assign_storage_role(client, workspace_name, compute_object):
 
     print(f"Ensuring RBAC for compute identity {compute_object.identity.principal_id}...")
     try:
-        ws = client.workspaces.get(workspace_name)
-        storage_id = ws.storage_account
-
-        storage_scope = storage_id
-
-        # Assign storage-related roles needed for batch orchestration
+        # Storage-related roles needed for batch orchestration plus workspace access.
+        # Assignments are independent, so create them and wait for their RBAC
+        # propagation concurrently.
         principal_id = compute_object.identity.principal_id
-        _ensure_role_assignment(principal_id, "Storage Blob Data Contributor", storage_scope)
-        _ensure_role_assignment(principal_id, "Storage Table Data Contributor", storage_scope, wait_seconds=30)
-        _ensure_role_assignment(principal_id, "Storage Queue Data Contributor", storage_scope, wait_seconds=30)
-
-        # Assign AzureML Data Scientist role on workspace for model access
-        workspace_id = (
-            f"/subscriptions/{client.subscription_id}/"
-            f"resourceGroups/{client.resource_group_name}/"
-            "providers/Microsoft.MachineLearningServices/workspaces/"
-            f"{workspace_name}"
-        )
-        print("")
-        _ensure_role_assignment(principal_id, "AzureML Data Scientist", workspace_id)
+        role_scopes = [(role_name, storage_scope) for role_name in STORAGE_ROLES]
+        role_scopes += [(role_name, workspace_id) for role_name in WORKSPACE_ROLES]
+        role_scopes = [
+            (role_name, scope)
+            for role_name, scope in role_scopes
+            if (principal_id, scope, _role_guid(_get_role_definition_id(auth_client, scope, role_name)))
+            not in _confirmed_role_assignments
+        ]
+        if not role_scopes:
+            print("All role assignments were already confirmed in this process.")
+            return
+
+        # Existing assignments are fetched once per scope rather than once per role.
+        assigned_roles = {
+            scope: _fetch_assigned_roles(auth_client, principal_id, scope)
+            for scope in {scope for _, scope in role_scopes}
+        }
+        with ThreadPoolExecutor(max_workers=len(role_scopes)) as executor:
+            futures = [
+                executor.submit(
+                    _ensure_role_assignment,
+                    auth_client,
+                    principal_id,
+                    role_name,
+                    scope,
+                    assigned_roles=assigned_roles[scope],
+                )
+                for role_name, scope in role_scopes
+            ]
+            # Surface the first failure as soon as it happens rather than in submission order.
+            for future in as_completed(futures):
+                future.result()
 
     except Exception as e:
         print(f"ERROR: Could not assign roles: {e}")
@@ -137,12 +268,15 @@ def _get_or_create_compute_target(
             compute_object = client.compute.begin_create_or_update(compute_object).result()
             print(f"Identity enabled for {cluster_name}.")
 
-            # Wait a moment for identity to be fully provisioned
-            print("Waiting 30 seconds for identity provisioning...")
-            time.sleep(30)
+            # The operation result usually carries the principal_id already; only refresh
+            # the compute object, with a growing delay, while it is not available yet.
+            delay = 2
+            while not (compute_object.identity and compute_object.identity.principal_id) and delay <= 20:
+                print(f"Waiting {delay} seconds for identity provisioning...")
+                time.sleep(delay)
+                compute_object = client.compute.get(cluster_name)
+                delay *= 2
 
-            # Refresh compute object to get the principal_id
-            compute_object = client.compute.get(cluster_name)
             if compute_object.identity and compute_object.identity.principal_id:
                 print(f"Identity principal ID: {compute_object.identity.principal_id}")
             else:
@@ -173,27 +307,58 @@ def get_compute(
     min_instances: int = 0,
     max_instances: int = 4,
     idle_time_before_scale_down: int = 600,
+    ml_client: MLClient = None,
+    credential=None,
 ):
-    """Get an existing compute or create a new one."""
+    """
+    Get an existing compute or create a new one.
+
+    An existing ml_client for the same workspace can be passed to reuse its connection, and the
+    credential it was created with to reuse the token for the role assignments.
+    """
     try:
-        client = MLClient(
-            DefaultAzureCredential(),
-            subscription_id=subscription_id,
-            resource_group_name=resource_group_name,
-            workspace_name=workspace_name,
-        )
+        if credential is None:
+            credential = _get_credential()
+        if ml_client is None:
+            client = MLClient(
+                credential,
+                subscription_id=subscription_id,
+                resource_group_name=resource_group_name,
+                workspace_name=workspace_name,
+            )
+        else:
+            client = ml_client
+        auth_client = AuthorizationManagementClient(credential, subscription_id)
+        # The compute operation is the slow part, the workspace and role definition
+        # lookups needed for the role assignments are done while it runs.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            compute_future = executor.submit(
+                _get_or_create_compute_target,
+                client,
+                cluster_name,
+                cluster_size,
+                cluster_region,
+                min_instances,
+                max_instances,
+                idle_time_before_scale_down,
+            )
 
-        compute_object = _get_or_create_compute_target(
-            client,
-            cluster_name,
-            cluster_size,
-            cluster_region,
-            min_instances,
-            max_instances,
-            idle_time_before_scale_down,
-        )
+            workspace = client.workspaces.get(workspace_name)
+            storage_scope = workspace.storage_account
+            workspace_id = (
+                f"/subscriptions/{client.subscription_id}/"
+                f"resourceGroups/{client.resource_group_name}/"
+                "providers/Microsoft.MachineLearningServices/workspaces/"
+                f"{workspace.name}"
+            )
+            for role_name in STORAGE_ROLES:
+                _get_role_definition_id(auth_client, storage_scope, role_name)
+            for role_name in WORKSPACE_ROLES:
+                _get_role_definition_id(auth_client, workspace_id, role_name)
+
+            compute_object = compute_future.result()
 
-        _assign_storage_role(client, workspace_name, compute_object)
+        _assign_storage_role(auth_client, storage_scope, workspace_id, compute_object)
 
         # Workspace-level RBAC is now handled during infrastructure provisioning
         # to avoid conflicting role assignments.
@@ -168,8 +168,9 @@ def prepare_and_execute_pipeline(pipeline: PipelineJobConfig):
     config = MLOpsConfig(environment=pipeline.build_environment)
     pipeline_config = config.get_pipeline_config(pipeline.model_name)
 
+    credential = DefaultAzureCredential()
     ml_client = MLClient(
-        DefaultAzureCredential(),
+        credential,
         config.aml_config["subscription_id"],
         config.aml_config["resource_group_name"],
         config.aml_config["workspace_name"],
@@ -186,6 +187,8 @@ def prepare_and_execute_pipeline(pipeline: PipelineJobConfig):
             pipeline_config["cluster_name"],
             pipeline_config["cluster_size"],
             pipeline_config["cluster_region"],
+            ml_client=ml_client,
+            credential=credential,
         )
 
     environment = get_environment(
@@ -10,6 +10,7 @@ data assets and retrieving the latest version of these assets.
 import argparse
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from azure.identity import DefaultAzureCredential, ClientAssertionCredential
 from azure.ai.ml import MLClient
 from azure.ai.ml.entities import Data
@@ -17,13 +18,27 @@ from azure.ai.ml.constants import AssetTypes
 from mlops.common.config_utils import MLOpsConfig
 
 
+# Last token read by get_token with the (path, modification time) of its file.
+_cached_token = None
+_cached_token_key = None
+
+
 def get_token():
-    """Read the OIDC token from the file."""
+    """Read the OIDC token from the file, reading it again only when the file changed."""
+    global _cached_token, _cached_token_key
+
     token_file = os.getenv("AZURE_FEDERATED_TOKEN_FILE")
-    if token_file and os.path.exists(token_file):
+    if not token_file:
+        return None
+    try:
+        token_key = (token_file, os.stat(token_file).st_mtime_ns)
+    except OSError:
+        return None
+    if token_key != _cached_token_key:
         with open(token_file) as f:
-            return f.read().strip()
-    return None
+            _cached_token = f.read().strip()
+        _cached_token_key = token_key
+    return _cached_token
 
 
 def main():
@@ -66,26 +81,24 @@ def main():
     config_file = open(data_config_path)
     data_config = json.load(config_file)
 
-    for elem in data_config["datasets"]:
-        data_path = elem["DATA_PATH"]
-        dataset_desc = elem["DATASET_DESC"]
-        dataset_name = elem["DATASET_NAME"]
-
-        aml_dataset = Data(
-            path=data_path,
+    aml_datasets = [
+        Data(
+            path=elem["DATA_PATH"],
             type=AssetTypes.URI_FOLDER,
-            description=dataset_desc,
-            name=dataset_name,
+            description=elem["DATASET_DESC"],
+            name=elem["DATASET_NAME"],
         )
+        for elem in data_config["datasets"]
+    ]
 
-        # Use identity-based authentication by setting datastore credential
-        ml_client.data.create_or_update(aml_dataset)
-
-        aml_dataset_unlabeled = ml_client.data.get(
-            name=dataset_name, label="latest"
-        )
+    # Use identity-based authentication by setting datastore credential.
+    # Registrations are independent, so they are sent concurrently. The returned assets
+    # are the newly created latest versions, no need to get them again.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        registered_datasets = list(executor.map(ml_client.data.create_or_update, aml_datasets))
 
-        print(aml_dataset_unlabeled.id)
+    for registered_dataset in registered_datasets:
+        print(registered_dataset.id)
 
 
 if __name__ == "__main__":
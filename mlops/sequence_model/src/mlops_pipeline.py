@@ -308,8 +308,9 @@ def prepare_and_execute(
     """
     model_name = "sequence_model"
     config = MLOpsConfig(environment=build_environment)
+    credential = DefaultAzureCredential()
     ml_client = MLClient(
-        DefaultAzureCredential(),
+        credential,
         config.aml_config["subscription_id"],
         config.aml_config["resource_group_name"],
         config.aml_config["workspace_name"],
@@ -322,6 +323,8 @@ def prepare_and_execute(
         cluster_name=pipeline_config["cluster_name"],
         cluster_size=pipeline_config["cluster_size"],
         cluster_region=pipeline_config["cluster_region"],
+        ml_client=ml_client,
+        credential=credential,
     )
     environment = get_environment(
         subscription_id=config.aml_config["subscription_id"],
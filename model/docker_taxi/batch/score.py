@@ -3,8 +3,8 @@ import os
 import joblib
 import pandas as pd
 from typing import List
-import subprocess
 import json
+import urllib.request
 
 
 def init():
@@ -20,23 +20,23 @@ def init():
     print("BATCH SCORING IDENTITY DIAGNOSTICS")
     print("=" * 80)
 
-    try:
-        # Get the identity token metadata to see which identity is being used
-        result = subprocess.run(
-            ["curl", "-H", "Metadata:true", "http://169.254.169.254/metadata/identity/oauth2/token"
-             "?api-version=2018-02-01&resource=https://management.azure.com/"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0 and result.stdout:
-            token_info = json.loads(result.stdout)
+    # Querying the instance metadata service delays startup, so it is opt-in
+    if os.getenv("DEBUG_IDENTITY"):
+        try:
+            # Get the identity token metadata to see which identity is being used
+            request = urllib.request.Request(
+                "http://169.254.169.254/metadata/identity/oauth2/token"
+                "?api-version=2018-02-01&resource=https://management.azure.com/",
+                headers={"Metadata": "true"},
+            )
+            with urllib.request.urlopen(request, timeout=2) as response:
+                token_info = json.load(response)
             print(f"Running with managed identity - Client ID: {token_info.get('client_id', 'N/A')}")
             print(f"Resource: {token_info.get('resource', 'N/A')}")
-        else:
-            print("Could not retrieve identity token metadata")
-    except Exception as e:
-        print(f"Error checking identity: {e}")
+        except Exception as e:
+            print(f"Error checking identity: {e}")
+    else:
+        print("Set DEBUG_IDENTITY to log the managed identity in use")
 
     # Log environment info
     print(f"AZUREML_MODEL_DIR: {os.getenv('AZUREML_MODEL_DIR', 'Not set')}")
@@ -1,10 +1,12 @@
 """This module provides the functionality for initializing and running a machine learning model."""
 import os
 import joblib
+import numpy as np
 import pandas as pd
 from typing import List
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 import json
+import urllib.request
 
 
 def init():
@@ -20,23 +22,23 @@ def init():
     print("BATCH SCORING IDENTITY DIAGNOSTICS")
     print("=" * 80)
 
-    try:
-        # Get the identity token metadata to see which identity is being used
-        result = subprocess.run(
-            ["curl", "-H", "Metadata:true", "http://169.254.169.254/metadata/identity/oauth2/token"
-             "?api-version=2018-02-01&resource=https://management.azure.com/"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0 and result.stdout:
-            token_info = json.loads(result.stdout)
+    # Querying the instance metadata service delays startup, so it is opt-in
+    if os.getenv("DEBUG_IDENTITY"):
+        try:
+            # Get the identity token metadata to see which identity is being used
+            request = urllib.request.Request(
+                "http://169.254.169.254/metadata/identity/oauth2/token"
+                "?api-version=2018-02-01&resource=https://management.azure.com/",
+                headers={"Metadata": "true"},
+            )
+            with urllib.request.urlopen(request, timeout=2) as response:
+                token_info = json.load(response)
             print(f"Running with managed identity - Client ID: {token_info.get('client_id', 'N/A')}")
             print(f"Resource: {token_info.get('resource', 'N/A')}")
-        else:
-            print("Could not retrieve identity token metadata")
-    except Exception as e:
-        print(f"Error checking identity: {e}")
+        except Exception as e:
+            print(f"Error checking identity: {e}")
+    else:
+        print("Set DEBUG_IDENTITY to log the managed identity in use")
 
     # Log environment info
     print(f"AZUREML_MODEL_DIR: {os.getenv('AZUREML_MODEL_DIR', 'Not set')}")
@@ -49,33 +51,44 @@ def init():
     # deserialize the model file back into a sklearn model
     print(f"Loading model from: {model_path}")
     model = joblib.load(model_path)
+
+    # The linear model is scored in float32, halving the memory traffic of predict
+    if hasattr(model, "coef_"):
+        model.coef_ = model.coef_.astype(np.float32)
+        model.intercept_ = np.asarray(model.intercept_, dtype=np.float32)
     print("Init complete")
 
 
+def _read_csv(path: str) -> pd.DataFrame:
+    """Read a csv file with the pyarrow engine."""
+    return pd.read_csv(path, engine="pyarrow")
+
+
 def run(mini_batch: List[str]) -> pd.DataFrame:
     """
     Execure inferencing logic on a request.
 
-    In the example we extract the data from the json input and call the scikit-learn model's predict()
-    method and return the result back.
+    In the example we read all csv files of the mini batch, call the scikit-learn model's predict()
+    method once on the combined data and return the predictions.
     """
     import os
     print(os.environ.get("DEFAULT_IDENTITY_CLIENT_ID"))
 
-    results = []
-
     print("Request received")
 
+    if not mini_batch:
+        return pd.DataFrame({"prediction": []})
+
     for raw_data in mini_batch:
         print(f"File name: {raw_data}")
-        data = pd.read_csv(raw_data)
-
-        result = model.predict(data.to_numpy())
-        print(f"predicted results: {result}")
 
-        print("Item has been proccessed")
+    # Files are read concurrently with the multithreaded pyarrow csv parser, which releases the GIL
+    with ThreadPoolExecutor(max_workers=min(16, len(mini_batch))) as executor:
+        frames = list(executor.map(_read_csv, mini_batch))
 
-        # You need to implement a better way to combine results from the model depends on your desired output
-        results.append("Item has been processed")
+    # Score the whole mini batch with a single predict call instead of one per file
+    data = pd.concat(frames, ignore_index=True)
+    result = model.predict(data.to_numpy(dtype=np.float32))
+    print(f"predicted {len(result)} results for {len(mini_batch)} files")
 
-    return pd.DataFrame(results)
+    return pd.DataFrame({"prediction": result})
@@ -2,6 +2,8 @@
 
 import os
 import logging
+import mmap
+from functools import lru_cache
 import pandas as pd
 import pathlib
 from typing import List
@@ -49,35 +51,57 @@ def init():
     # deserialize the tokenizer
     tokenizer = Tokenizer()
     tokenizer.load(tokenizer_path)
+    _predict_next_words.cache_clear()
 
     logging.info("Init complete")
 
 
+@lru_cache(maxsize=200_000)
+def _predict_next_words(tokenized_data: tuple) -> tuple:
+    """Return the decoded top 3 next words, cached since short prefixes repeat a lot in text."""
+    return tuple(tokenizer.dec(model.predict(tokenized_data, top_n=3)))
+
+
+def _process_file(raw_data: str) -> List[tuple]:
+    """Return a (file, input sequence, prediction 1, prediction 2, prediction 3) row per line of the file."""
+    print(f"File name: {raw_data}")
+    # The file is memory mapped and decoded in one go rather than line by line
+    with open(raw_data, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            content = b""
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = mm[:]
+    lines = [line.strip() for line in content.decode("utf-8").splitlines()]
+
+    rows = []
+    # Encode all lines of the file in a single call
+    for line, tokenized_data in zip(lines, tokenizer.enc_batch(lines)):
+        preds = _predict_next_words(tokenized_data)
+        print("Input data:", line)
+        print("Possible choices for next word:", preds)
+
+        preds = preds + (None,) * (3 - len(preds))
+        rows.append((raw_data, line) + preds[:3])
+
+    print(f"File name: {raw_data} has been processed")
+    return rows
+
+
 def run(mini_batch: List[str]) -> pd.DataFrame:
     """
     Execure inferencing logic on a request.
 
-    In the example we extract the data from the json input and call the scikit-learn model's predict()
-    method and return the result back.
+    In the example we predict the next three words for every line of the input files
+    and return one row per line.
     """
-    results = []
-
     print("Request received")
 
-    for raw_data in mini_batch:
-        print(f"File name: {raw_data}")
-        with open(raw_data, "r") as f:
-            for line in f:
-                data = line.strip().split(" ")
-                tokenized_data = tuple(tokenizer.enc(words=data))
-                result = model.predict(tokenized_data, top_n=3)
-                preds = tokenizer.dec(result)
-                print("Input data:", line.strip())
-                print("Possible choices for next word:", preds)
-
-        print(f"File name: {raw_data} has been processed")
+    # Files are scored sequentially in this process, so the prediction cache filled by
+    # earlier mini-batches is reused. AzureML already runs several run() workers per node.
+    file_rows = [_process_file(raw_data) for raw_data in mini_batch]
 
-        # You need to implement a better way to combine results from the model depends on your desired output
-        results.append(f"File name: {raw_data} has been processed")
-
-    return pd.DataFrame(results)
+    return pd.DataFrame(
+        [row for rows in file_rows for row in rows],
+        columns=["file", "input_sequence", "prediction_1", "prediction_2", "prediction_3"],
+    )
@@ -58,7 +58,7 @@ def load_test_data(test_data):
     df_list = []
     for filename in arr:
         print("reading file: %s ..." % filename)
-        input_df = pd.read_csv((Path(test_data) / filename))
+        input_df = pd.read_parquet((Path(test_data) / filename), engine="pyarrow")
         df_list.append(input_df)
 
     test_data = df_list[0]
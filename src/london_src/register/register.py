@@ -1,16 +1,18 @@
 """Register machine learning models with MLflow, with AML fallback."""
 import argparse
-import json
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 
-from importlib import metadata
-import mlflow
 try:
-    from mlflow.exceptions import RestException
-except Exception:  # pragma: no cover
-    RestException = None
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# mlflow and the azure SDKs are imported where they are used, importing them is the
+# slowest part of this step and not needed to parse arguments and read the inputs.
 
 
 def main(model_metadata, model_name, score_report, build_reference):
@@ -29,13 +31,16 @@ def main(model_metadata, model_name, score_report, build_reference):
         mm_path = _resolve_model_metadata_path(model_metadata)
         md = _read_json(mm_path)
         run_uri = md["run_uri"]
-        run_id = md.get("run_id")
+        # The run URI is parsed once, its run id also covers metadata written without one
+        uri_run_id, artifact_subpath = _parse_run_uri(run_uri)
+        run_id = md.get("run_id") or uri_run_id
 
         cod, mse, coff = _read_score(Path(score_report) / "score.txt")
 
         model_version = _register_with_fallback(
             run_uri=run_uri,
             run_id=run_id,
+            artifact_subpath=artifact_subpath,
             model_name=model_name,
             mse=mse,
             coff=coff,
@@ -43,43 +48,16 @@ def main(model_metadata, model_name, score_report, build_reference):
             build_reference=build_reference,
         )
 
-        # Set tags if MLflow model registry returned a model version
-        if hasattr(model_version, "version"):
-            client = mlflow.MlflowClient()
-            client.set_model_version_tag(
-                name=model_name,
-                version=model_version.version,
-                key="mse",
-                value=mse,
-            )
-            client.set_model_version_tag(
-                name=model_name,
-                version=model_version.version,
-                key="coff",
-                value=coff,
-            )
-            client.set_model_version_tag(
-                name=model_name,
-                version=model_version.version,
-                key="cod",
-                value=cod,
-            )
-            client.set_model_version_tag(
-                name=model_name,
-                version=model_version.version,
-                key="build_id",
-                value=build_reference,
-            )
-
         print(model_version)
     except Exception as ex:
-        print(ex)
-        raise
+        print(ex, file=sys.stderr)
+        sys.exit(1)
 
 
 def _register_with_fallback(
     run_uri: str,
     run_id: Optional[str],
+    artifact_subpath: str,
     model_name: str,
     mse: Optional[float],
     coff: Optional[float],
@@ -87,33 +65,37 @@ def _register_with_fallback(
     build_reference: Optional[str],
 ):
     """Try MLflow registration; on plugin mismatch, fall back to AML model asset."""
-    # Pre-check: if artifact path 'model' is expected but missing, skip MLflow registration.
-    if run_uri.startswith("runs:/"):
-        parts = run_uri.split("/")
-        _rid = parts[1]
-        artifact_subpath = "/".join(parts[2:]) if len(parts) > 2 else ""
-        if artifact_subpath == "model":
-            try:
-                arts = mlflow.MlflowClient().list_artifacts(_rid, path="model")
-                if not arts:
-                    print(
-                        "No 'model' artifact found; using AML fallback."  # shortened
-                    )
-                    return _fallback_register_azureml_model(
-                        model_name=model_name,
-                        run_id=run_id,
-                        mse=mse,
-                        coff=coff,
-                        cod=cod,
-                        build_reference=build_reference,
-                    )
-            except Exception as pre_err:
+    import mlflow
+    from mlflow.exceptions import RestException
+
+    # Optional pre-check: if artifact path 'model' is expected but missing, skip MLflow registration.
+    # A missing artifact is also detected from the 404 of register_model below, so the extra
+    # listing round-trip is only made when REGISTER_STRICT_PRECHECK is set.
+    if os.environ.get("REGISTER_STRICT_PRECHECK") and run_id and artifact_subpath == "model":
+        try:
+            arts = mlflow.MlflowClient().list_artifacts(run_id, path="model")
+            if not arts:
                 print(
-                    f"Artifact listing failed ({pre_err}); continuing MLflow attempt."
+                    "No 'model' artifact found; using AML fallback."  # shortened
+                )
+                return _fallback_register_azureml_model(
+                    model_name=model_name,
+                    run_id=run_id,
+                    mse=mse,
+                    coff=coff,
+                    cod=cod,
+                    build_reference=build_reference,
                 )
+        except Exception as pre_err:
+            print(
+                f"Artifact listing failed ({pre_err}); continuing MLflow attempt."
+            )
 
     try:
-        mv = mlflow.register_model(run_uri, model_name)
+        # Tags are created together with the model version instead of one request per tag
+        mv = mlflow.register_model(
+            run_uri, model_name, tags=_build_tags(mse, coff, cod, build_reference)
+        )
         print("Registered via MLflow registry.")
         return mv
     except TypeError as e:
@@ -127,10 +109,9 @@ def _register_with_fallback(
             build_reference=build_reference,
         )
     except Exception as re:
-        # Handle missing artifact 404 only if RestException available
+        # Handle missing artifact 404
         if (
-            RestException
-            and isinstance(re, RestException)
+            isinstance(re, RestException)
             and getattr(re, "error_code", "").upper() == "RESOURCE_DOES_NOT_EXIST"
         ):
             print(
@@ -157,8 +138,6 @@ def _fallback_register_azureml_model(
 ):
     """Fallback: create an Azure ML Model asset from the run's artifact path."""
     try:
-        from azure.identity import DefaultAzureCredential
-        from azure.ai.ml import MLClient
         from azure.ai.ml.entities import Model
     except Exception as imp_err:
         print("azure.ai.ml not available; cannot fallback:", imp_err)
@@ -177,12 +156,7 @@ def _fallback_register_azureml_model(
     print(f"Attempting AML Model registration from: {aml_artifact_uri}")
 
     try:
-        ml_client = MLClient(
-            DefaultAzureCredential(),
-            subscription_id=sub,
-            resource_group_name=rg,
-            workspace_name=ws,
-        )
+        ml_client = _aml_client(sub, rg, ws)
         tags = _build_tags(mse, coff, cod, build_reference)
         model = Model(name=model_name, path=aml_artifact_uri, type="mlflow_model", tags=tags)
         created = ml_client.models.create_or_update(model)
@@ -199,7 +173,24 @@ def _fallback_register_azureml_model(
         return None
 
 
+@lru_cache(maxsize=1)
+def _aml_client(sub: str, rg: str, ws: str):
+    """Return an MLClient for the workspace, created once per process."""
+    from azure.identity import DefaultAzureCredential
+    from azure.ai.ml import MLClient
+
+    # Interactive and IDE credentials never apply on pipeline compute, skip probing them.
+    credential = DefaultAzureCredential(
+        exclude_interactive_browser_credential=True,
+        exclude_visual_studio_code_credential=True,
+        exclude_shared_token_cache_credential=True,
+    )
+    return MLClient(credential, subscription_id=sub, resource_group_name=rg, workspace_name=ws)
+
+
 def _print_versions() -> None:
+    from importlib import metadata
+
     print("=" * 50)
     print("PACKAGE VERSIONS:")
     try:
@@ -219,16 +210,23 @@ def _resolve_model_metadata_path(model_metadata: str) -> Path:
         candidate = p / "model_metadata.json"
         if candidate.exists():
             return candidate
-        json_files = list(p.glob("*.json"))
-        if not json_files:
+        json_file = next(p.glob("*.json"), None)
+        if json_file is None:
             raise FileNotFoundError(f"No model metadata JSON found under folder: {p}")
-        return json_files[0]
+        return json_file
     return p
 
 
+def _parse_run_uri(run_uri: str) -> Tuple[Optional[str], str]:
+    """Return the run id and artifact subpath of a runs:/<run_id>/<artifact_subpath> URI."""
+    if not run_uri.startswith("runs:/"):
+        return None, ""
+    run_id, _, artifact_subpath = run_uri[len("runs:/"):].partition("/")
+    return run_id or None, artifact_subpath
+
+
 def _read_json(path: Path) -> dict:
-    with open(path) as f:
-        return json.load(f)
+    return _json.loads(Path(path).read_bytes())
 
 
 def _read_score(score_path: Path) -> Tuple[float, float, float]:
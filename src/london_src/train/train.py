@@ -3,16 +3,44 @@
 import argparse
 import json
 import os
+import pickle
 from pathlib import Path
 
 import mlflow
 from mlflow.sklearn import save_model as mlflow_save_model
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from sklearn.model_selection import train_test_split
 from importlib import metadata
 
 
+# Model features, read from the transformed data together with the "cost" label.
+FEATURE_COLUMNS = [
+    "distance",
+    "dropoff_latitude",
+    "dropoff_longitude",
+    "passengers",
+    "pickup_latitude",
+    "pickup_longitude",
+    "store_forward",
+    "vendor",
+    "pickup_weekday",
+    "pickup_month",
+    "pickup_monthday",
+    "pickup_hour",
+    "pickup_minute",
+    "pickup_second",
+    "dropoff_weekday",
+    "dropoff_month",
+    "dropoff_monthday",
+    "dropoff_hour",
+    "dropoff_minute",
+    "dropoff_second",
+]
+INPUT_COLUMNS = FEATURE_COLUMNS + ["cost"]
+
+
 def _safe_version(dist_name: str) -> str:
     """Return installed version for a distribution or 'not-installed'."""
     try:
@@ -53,13 +81,10 @@ def main(training_data, test_data, model_output, model_metadata):
     arr = os.listdir(training_data)
     print(arr)
 
-    df_list = []
-    for filename in arr:
-        print("reading file: %s ..." % filename)
-        input_df = pd.read_csv((Path(training_data) / filename))
-        df_list.append(input_df)
-
-    train_data = df_list[0]
+    # The transform step writes a single file, only that one is read
+    filename = arr[0]
+    print("reading file: %s ..." % filename)
+    train_data = pd.read_parquet((Path(training_data) / filename), engine="pyarrow", columns=INPUT_COLUMNS)
     print(train_data.columns)
 
     train_x, test_x, trainy, testy = split(train_data)
@@ -82,30 +107,7 @@ def split(train_data):
     """
     # Split the data into input(X) and output(y)
     y = train_data["cost"]
-    x = train_data[
-        [
-            "distance",
-            "dropoff_latitude",
-            "dropoff_longitude",
-            "passengers",
-            "pickup_latitude",
-            "pickup_longitude",
-            "store_forward",
-            "vendor",
-            "pickup_weekday",
-            "pickup_month",
-            "pickup_monthday",
-            "pickup_hour",
-            "pickup_minute",
-            "pickup_second",
-            "dropoff_weekday",
-            "dropoff_month",
-            "dropoff_monthday",
-            "dropoff_hour",
-            "dropoff_minute",
-            "dropoff_second",
-        ]
-    ]
+    x = train_data[FEATURE_COLUMNS]
 
     # Encode non-numeric columns to numeric (e.g., vendor, store_forward)
     for col in x.columns:
@@ -122,6 +124,38 @@ def split(train_data):
     return train_x, test_x, trainy, testy
 
 
+def _fit_linear_regression(train_x, trainy):
+    """
+    Fit a Linear Regression model with a single float32 least squares solve.
+
+    The solution is loaded into a LinearRegression so the model is logged and
+    predicted with exactly like a model fitted by sklearn.
+
+    Parameters:
+    train_x (DataFrame): The training data.
+    trainy (Series): The training labels.
+
+    Returns:
+    model (LinearRegression): The fitted model.
+    """
+    x = train_x.to_numpy(dtype=np.float32, copy=False)
+    y = trainy.to_numpy(dtype=np.float32, copy=False)
+    # Like LinearRegression, solve on centered data and derive the intercept from the means,
+    # so a feature that is constant in the training data gets a zero coefficient
+    x_mean = x.mean(axis=0)
+    y_mean = y.mean()
+    coef, _, rank, singular = np.linalg.lstsq(x - x_mean, y - y_mean, rcond=None)
+
+    model = LinearRegression()
+    model.coef_ = coef
+    model.intercept_ = y_mean - x_mean @ coef
+    model.rank_ = rank
+    model.singular_ = singular
+    model.n_features_in_ = x.shape[1]
+    model.feature_names_in_ = np.asarray(train_x.columns, dtype=object)
+    return model
+
+
 def train_model(train_x, trainy, model_output, model_metadata):
     """
     Train a Linear Regression model and save the model and its metadata.
@@ -133,11 +167,14 @@ def train_model(train_x, trainy, model_output, model_metadata):
     Returns:
     None
     """
-    mlflow.autolog()
     # Train a Linear Regression Model with the train set
     with mlflow.start_run() as run:
-        model = LinearRegression().fit(train_x, trainy)
-        print(model.score(train_x, trainy))
+        # All features are numeric, solving in float32 halves the working set of the solver
+        model = _fit_linear_regression(train_x, trainy)
+        # Log only what is used instead of patching sklearn through autolog
+        training_score = model.score(train_x, trainy)
+        print(training_score)
+        mlflow.log_metric("training_r2_score", training_score)
 
         # Log the model to MLflow under the standard artifact path "model"
         # Prefer MLflow logging; fall back to local pickle on AML plugin mismatch
@@ -145,12 +182,8 @@ def train_model(train_x, trainy, model_output, model_metadata):
             mlflow.sklearn.log_model(model, artifact_path="model")
             model_artifact_logged = True
         except TypeError as e:
-            from pathlib import Path
-            import pickle
-            print(f"mlflow.log_model failed ({e}); saving local pickle instead")
-            Path(model_output).mkdir(parents=True, exist_ok=True)
-            with open(Path(model_output) / "model.pkl", "wb") as f:
-                pickle.dump(model, f)
+            # The model.sav pickle written below is kept as the local copy
+            print(f"mlflow.log_model failed ({e}); keeping local pickle only")
             # Attempt to build a minimal MLflow model directory and log it so that
             # later registration step finds an artifact path. If this also fails,
             # we will record a flag in metadata.
@@ -179,13 +212,14 @@ def train_model(train_x, trainy, model_output, model_metadata):
         with open(model_metadata, "w") as json_file:
             json.dump(model_data, json_file, indent=4)
 
-        # Optionally also dump a pickle alongside for local debugging
-        pickle.dump(model, open((Path(model_output) / "model.sav"), "wb"))
+        # The predict and score steps load the model from this pickle
+        with open(Path(model_output) / "model.sav", "wb") as f:
+            pickle.dump(model, f)
 
 
 def write_test_data(test_x, testy, test_data_path):
     """
-    Write the testing data to a CSV file.
+    Write the testing data to a parquet file.
 
     Parameters:
     testX (DataFrame): The testing data.
@@ -198,7 +232,9 @@ def write_test_data(test_x, testy, test_data_path):
     print(test_x.shape)
     # Ensure parent directory exists (mounts are usually present but safe to create)
     Path(test_data_path).mkdir(parents=True, exist_ok=True)
-    test_x.to_csv((Path(test_data_path) / "test_data.csv"))
+    test_x.to_parquet(
+        (Path(test_data_path) / "test_data.parquet"), engine="pyarrow", compression="snappy", index=False
+    )
 
 
 if __name__ == "__main__":
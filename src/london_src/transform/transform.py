@@ -5,10 +5,9 @@ Pipeline:
 1. Read cleaned input files
 2. Filter coordinates outside service bounds
 3. Normalize dtypes (lat/long, distance)
-4. Derive granular time features (weekday, month, day, hour, minute, second)
-5. Drop coarse date/time columns
-6. Convert categorical store_forward to binary
-7. Remove zero distance or zero cost outliers
+4. Convert categorical store_forward to binary
+5. Remove zero distance or zero cost outliers
+6. Derive granular time features (weekday, month, day, hour, minute, second)
 """
 
 import argparse
@@ -18,9 +17,38 @@ import pandas as pd
 import numpy as np
 
 
+# Columns of the cleaned data used by transform_data, in file order, other columns are not read.
+# float32 gives about a metre of precision for coordinates, which is ample for the model.
+INPUT_COLUMNS = [
+    "cost",
+    "distance",
+    "dropoff_datetime",
+    "dropoff_latitude",
+    "dropoff_longitude",
+    "passengers",
+    "pickup_datetime",
+    "pickup_latitude",
+    "pickup_longitude",
+    "store_forward",
+    "vendor",
+]
+INPUT_DTYPES = {
+    "cost": "float64",
+    "distance": "float32",
+    "dropoff_latitude": "float32",
+    "dropoff_longitude": "float32",
+    "pickup_latitude": "float32",
+    "pickup_longitude": "float32",
+    # The few distinct store_forward flags are kept as integer codes instead of strings
+    "store_forward": "category",
+    # Nullable, so an empty vendor cell is read as missing instead of failing the step
+    "vendor": "Int8",
+}
+
+
 def main(clean_data, transformed_data):
     """
-    Initiate transformation and save results into csv file.
+    Initiate transformation and save results into a parquet file.
 
     Parameters:
       clean_data (str): a folder to store results
@@ -38,18 +66,23 @@ def main(clean_data, transformed_data):
     arr = os.listdir(clean_data)
     print(arr)
 
-    df_list = []
-    for filename in arr:
-        print("reading file: %s ..." % filename)
-        input_df = pd.read_csv((Path(clean_data) / filename))
-        df_list.append(input_df)
+    # Only the merged green and yellow taxi data written by the prep step is transformed
+    filename = "merged_data.csv"
+    print("reading file: %s ..." % filename)
+    combined_df = pd.read_csv(
+        (Path(clean_data) / filename), engine="pyarrow", usecols=INPUT_COLUMNS, dtype=INPUT_DTYPES
+    )
 
     # Transform the data
-    combined_df = df_list[1]
     final_df = transform_data(combined_df)
 
-    # Output data
-    final_df.to_csv((Path(args.transformed_data) / "transformed_data.csv"))
+    # Output data as parquet, which is written and read column wise by pyarrow
+    final_df.to_parquet(
+        (Path(args.transformed_data) / "transformed_data.parquet"),
+        engine="pyarrow",
+        compression="snappy",
+        index=False,
+    )
 
 
 # These functions filter out coordinates for locations that are outside the city border.
@@ -73,85 +106,63 @@ def transform_data(combined_df):
     """
     combined_df = combined_df.astype(
         {
-            "pickup_longitude": "float64",
-            "pickup_latitude": "float64",
-            "dropoff_longitude": "float64",
-            "dropoff_latitude": "float64",
+            "pickup_longitude": "float32",
+            "pickup_latitude": "float32",
+            "dropoff_longitude": "float32",
+            "dropoff_latitude": "float32",
         }
     )
 
-    latlong_filtered_df = combined_df[
-        (combined_df.pickup_longitude <= -73.72)
-        & (combined_df.pickup_longitude >= -74.09)
-        & (combined_df.pickup_latitude <= 40.88)
-        & (combined_df.pickup_latitude >= 40.53)
-        & (combined_df.dropoff_longitude <= -73.72)
-        & (combined_df.dropoff_longitude >= -74.72)
-        & (combined_df.dropoff_latitude <= 40.88)
-        & (combined_df.dropoff_latitude >= 40.53)
-    ]
-
-    latlong_filtered_df.reset_index(inplace=True, drop=True)
+    # Evaluate all bounds on the raw NumPy arrays into a single mask, no intermediate Series
+    plon, plat, dlon, dlat = combined_df[
+        ["pickup_longitude", "pickup_latitude", "dropoff_longitude", "dropoff_latitude"]
+    ].to_numpy().T
+    mask = (
+        (plon <= -73.72)
+        & (plon >= -74.09)
+        & (plat <= 40.88)
+        & (plat >= 40.53)
+        & (dlon <= -73.72)
+        & (dlon >= -74.72)
+        & (dlat <= 40.88)
+        & (dlat >= 40.53)
+    )
+    # Each step rebinds the same name and updates single columns, so no intermediate
+    # data frames are kept alive until the function returns.
+    final_df = combined_df[mask].reset_index(drop=True)
+    del combined_df
 
-    # These functions replace undefined values and rename to use meaningful names.
-    replaced_stfor_vals_df = latlong_filtered_df.replace(
-        {"store_forward": "0"}, {"store_forward": "N"}
-    ).fillna({"store_forward": "N"})
+    # distance is read as float32, so ".00" is already parsed as 0, only missing values remain.
+    final_df["distance"] = final_df["distance"].fillna(0).astype("float32")
 
-    replaced_distance_vals_df = replaced_stfor_vals_df.replace(
-        {"distance": ".00"}, {"distance": 0}
-    ).fillna({"distance": 0})
+    # Change the store_forward column to binary values, missing and "0" flags mean "N" and any
+    # other flag means 1. On the categorical column these checks compare integer codes, not strings.
+    store_forward = final_df["store_forward"]
+    final_df["store_forward"] = (~(store_forward.isna() | store_forward.isin(["N", "0"]))).astype(np.int8)
 
-    normalized_df = replaced_distance_vals_df.astype({"distance": "float64"})
+    # Filter out cost or distance == 0 rows to reduce outliers.
+    # This is done before deriving the time features so only the kept rows are processed.
+    final_df = final_df[(final_df.distance > 0) & (final_df.cost > 0)].reset_index(drop=True)
 
     # These functions transform the renamed data to be used finally for training.
 
     # Derive granular date/time features then drop original columns.
+    # The coarse date and time of day are not used as features, so they are not derived at all.
+    # All components fit into int8.
+    for prefix in ("pickup", "dropoff"):
+        timestamps = pd.to_datetime(final_df[f"{prefix}_datetime"], cache=True).dt
+        final_df[f"{prefix}_weekday"] = timestamps.dayofweek.astype(np.int8)
+        final_df[f"{prefix}_month"] = timestamps.month.astype(np.int8)
+        final_df[f"{prefix}_monthday"] = timestamps.day.astype(np.int8)
+        final_df[f"{prefix}_hour"] = timestamps.hour.astype(np.int8)
+        final_df[f"{prefix}_minute"] = timestamps.minute.astype(np.int8)
+        final_df[f"{prefix}_second"] = timestamps.second.astype(np.int8)
+
+    del final_df["pickup_datetime"]
+    del final_df["dropoff_datetime"]
 
-    temp = pd.DatetimeIndex(normalized_df["pickup_datetime"], dtype="datetime64[ns]")
-    normalized_df["pickup_date"] = temp.date
-    normalized_df["pickup_weekday"] = temp.dayofweek
-    normalized_df["pickup_month"] = temp.month
-    normalized_df["pickup_monthday"] = temp.day
-    normalized_df["pickup_time"] = temp.time
-    normalized_df["pickup_hour"] = temp.hour
-    normalized_df["pickup_minute"] = temp.minute
-    normalized_df["pickup_second"] = temp.second
-
-    temp = pd.DatetimeIndex(normalized_df["dropoff_datetime"], dtype="datetime64[ns]")
-    normalized_df["dropoff_date"] = temp.date
-    normalized_df["dropoff_weekday"] = temp.dayofweek
-    normalized_df["dropoff_month"] = temp.month
-    normalized_df["dropoff_monthday"] = temp.day
-    normalized_df["dropoff_time"] = temp.time
-    normalized_df["dropoff_hour"] = temp.hour
-    normalized_df["dropoff_minute"] = temp.minute
-    normalized_df["dropoff_second"] = temp.second
-
-    del normalized_df["pickup_datetime"]
-    del normalized_df["dropoff_datetime"]
-
-    normalized_df.reset_index(inplace=True, drop=True)
-
-    print(normalized_df.head)
-    print(normalized_df.dtypes)
-
-    # Drop coarse date/time columns (granular features are more predictive).
-    del normalized_df["pickup_date"]
-    del normalized_df["dropoff_date"]
-    del normalized_df["pickup_time"]
-    del normalized_df["dropoff_time"]
-
-    # Change the store_forward column to binary values
-    normalized_df["store_forward"] = np.where(
-        (normalized_df.store_forward == "N"), 0, 1
-    )
-
-    # Filter out cost or distance == 0 rows to reduce outliers.
-
-    final_df = normalized_df[(normalized_df.distance > 0) & (normalized_df.cost > 0)]
-    final_df.reset_index(inplace=True, drop=True)
     print(final_df.head)
+    print(final_df.dtypes)
 
     return final_df
 
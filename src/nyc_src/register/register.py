@@ -1,9 +1,12 @@
 """This module is designed for registering machine learning models in MLflow."""
-import mlflow
 import argparse
-import json
 from pathlib import Path
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 
 def main(model_metadata, model_name, score_report, build_reference):
     """
@@ -32,44 +35,25 @@ def main(model_metadata, model_name, score_report, build_reference):
             print(f"Could not get package versions: {e}")
         print("=" * 50)
 
-        run_file = open(args.model_metadata)
-        model_metadata = json.load(run_file)
+        model_metadata = _json.loads(Path(args.model_metadata).read_bytes())
         run_uri = model_metadata["run_uri"]
 
-        score_file = open(Path(args.score_report) / "score.txt")
-        score_data = json.load(score_file)
+        score_data = _json.loads((Path(args.score_report) / "score.txt").read_bytes())
         cod = score_data["cod"]
         mse = score_data["mse"]
         coff = score_data["coff"]
 
-        # Ensure MLflow is properly configured for Azure ML
-        mlflow.set_tracking_uri(mlflow.get_tracking_uri())
-
-        model_version = mlflow.register_model(run_uri, model_name)
+        # mlflow is slow to import, so it is only imported once the inputs have been read
+        import mlflow
 
-        client = mlflow.MlflowClient()
-        client.set_model_version_tag(
-            name=model_name, version=model_version.version, key="mse", value=mse
-        )
-        client.set_model_version_tag(
-            name=model_name, version=model_version.version, key="coff", value=coff
-        )
-        client.set_model_version_tag(
-            name=model_name, version=model_version.version, key="cod", value=cod
-        )
-        client.set_model_version_tag(
-            name=model_name,
-            version=model_version.version,
-            key="build_id",
-            value=build_reference,
-        )
+        # Tags are created together with the model version instead of one request per tag
+        tags = {"mse": mse, "coff": coff, "cod": cod, "build_id": build_reference}
+        model_version = mlflow.register_model(run_uri, model_name, tags=tags)
 
         print(model_version)
     except Exception as ex:
         print(ex)
         raise
-    finally:
-        run_file.close()
 
 
 if __name__ == "__main__":
@@ -287,8 +287,10 @@ class NgramModel:
             "vocab_size": self.vocab_size,
             "max_top_n": self.max_top_n,
         }
-        with open(save_path, "wb") as f:
-            pickle.dump(model_dict, f)
+        # Training and scoring environments all run Python 3.10, so the binary protocol 5
+        # can be used in place of the default protocol 4
+        with open(save_path, "wb", buffering=1 << 20) as f:
+            pickle.dump(model_dict, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     def load(self, model_dict: str):
         """De-serialize the model dictionary to use a pretrained model from disc."""
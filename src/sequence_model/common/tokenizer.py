@@ -84,15 +84,9 @@ class Tokenizer(object):
         Returns:
             tokenized_corpus (List[int]): A list of integers representing the tokenized corpus
         """
-        tokenized_corpus = []
-
-        for word in corpus:
-            if word in self.words_to_i.keys():
-                tokenized_corpus.append(self.words_to_i[word])
-            else:
-                tokenized_corpus.append(self.words_to_i[self.unk_word])
-
-        return tokenized_corpus
+        words_to_i = self.words_to_i
+        unk = words_to_i[self.unk_word]
+        return [words_to_i.get(word, unk) for word in corpus]
 
     def enc(self, words: list[str]) -> list[int]:
         """Return list of ints from list of strings."""
@@ -105,6 +99,12 @@ class Tokenizer(object):
             for word in words
         ]
 
+    def enc_batch(self, lines: list[str]) -> list[tuple[int, ...]]:
+        """Return a tuple of ints for every line of space separated words."""
+        words_to_i = self.words_to_i
+        unk = words_to_i[self.unk_word]
+        return [tuple([words_to_i.get(word, unk) for word in line.split(" ")]) for line in lines]
+
     def dec(self, tokens: list[int]) -> list[str]:
         """Return list of strings from list of ints."""
         return [
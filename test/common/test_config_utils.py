@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from mlops.common import config_utils
+from mlops.common.config_utils import MLOpsConfig
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches():
+    config_utils._CONFIG_CACHE.clear()
+    config_utils._EXPANDED_CONFIG_CACHE.clear()
+    yield
+    config_utils._CONFIG_CACHE.clear()
+    config_utils._EXPANDED_CONFIG_CACHE.clear()
+
+
+def _write_config(config_path, text, mtime_offset=0):
+    config_path.write_text(text, encoding="utf-8")
+    if mtime_offset:
+        mtime = os.path.getmtime(config_path) + mtime_offset
+        os.utime(config_path, (mtime, mtime))
+
+
+def test_config_reloaded_when_file_changes(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, "aml_config:\n  workspace_name: first\n")
+    assert MLOpsConfig(config_path=config_path).aml_config == {"workspace_name": "first"}
+
+    # The json cache written by the first load is older than the changed yaml file
+    _write_config(config_path, "aml_config:\n  workspace_name: second\n", mtime_offset=10)
+    assert MLOpsConfig(config_path=config_path).aml_config == {"workspace_name": "second"}
+
+
+def test_config_json_cache_used_while_file_unchanged(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, "aml_config:\n  workspace_name: first\n")
+    MLOpsConfig(config_path=config_path).aml_config
+
+    json_path = config_path.with_suffix(".json")
+    assert json_path.exists()
+    config_utils._CONFIG_CACHE.clear()
+    json_path.write_text('{"aml_config": {"workspace_name": "from json"}}', encoding="utf-8")
+    assert MLOpsConfig(config_path=config_path).aml_config == {"workspace_name": "from json"}
+
+
+def test_config_damaged_json_cache_is_rebuilt(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, "aml_config:\n  workspace_name: first\n")
+    json_path = config_path.with_suffix(".json")
+    json_path.write_text('{"aml_config": ', encoding="utf-8")
+
+    assert MLOpsConfig(config_path=config_path).aml_config == {"workspace_name": "first"}
+    assert json_path.read_text(encoding="utf-8") == '{"aml_config": {"workspace_name": "first"}}'
+
+
+def test_config_expanded_again_when_env_var_changes(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, "aml_config:\n  workspace_name: ws-${TEST_WORKSPACE}\n")
+
+    monkeypatch.setenv("TEST_WORKSPACE", "dev")
+    assert MLOpsConfig(config_path=config_path).aml_config == {"workspace_name": "ws-dev"}
+
+    monkeypatch.setenv("TEST_WORKSPACE", "prod")
+    assert MLOpsConfig(config_path=config_path).aml_config == {"workspace_name": "ws-prod"}
+
+
+def test_config_expanded_values_keep_yaml_types(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    _write_config(
+        config_path,
+        "environment_configuration:\n"
+        "  build_reference: ${TEST_BUILD_ID}\n"
+        "  enabled: ${TEST_ENABLED}\n"
+        "  missing: ${TEST_EMPTY}\n"
+        "  label: ${TEST_LABEL}\n",
+    )
+    monkeypatch.setenv("TEST_BUILD_ID", "123")
+    monkeypatch.setenv("TEST_ENABLED", "true")
+    monkeypatch.setenv("TEST_EMPTY", "")
+    monkeypatch.setenv("TEST_LABEL", "key: value")
+
+    assert MLOpsConfig(config_path=config_path).environment_configuration == {
+        "build_reference": 123,
+        "enabled": True,
+        "missing": None,
+        "label": "key: value",
+    }
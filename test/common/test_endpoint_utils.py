@@ -0,0 +1,121 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+from mlops.common import endpoint_utils
+from mlops.common.endpoint_utils import begin_with_retry, wait_for_endpoint_ready
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the requested sleeps instead of waiting."""
+    calls = []
+    monkeypatch.setattr(time, "sleep", calls.append)
+    return calls
+
+
+class _Poller:
+    def __init__(self, result):
+        self._result = result
+
+    def result(self):
+        return self._result
+
+
+def _begin_operation(*outcomes):
+    """Return a begin operation that raises or returns the given outcomes in order."""
+    remaining = list(outcomes)
+    calls = []
+
+    def begin():
+        calls.append(1)
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _Poller(outcome)
+
+    begin.calls = calls
+    return begin
+
+
+def _conflict():
+    return ResourceExistsError("Conflict: There is already running method on the resource")
+
+
+def test_begin_with_retry_retries_after_conflict(sleeps):
+    begin = _begin_operation(_conflict(), "deployed")
+
+    assert begin_with_retry(begin, initial_delay=1, max_delay=4) == "deployed"
+    assert len(begin.calls) == 2
+    # One exponential delay plus up to 10 seconds of jitter
+    assert len(sleeps) == 1 and 1 <= sleeps[0] <= 14
+
+
+def test_begin_with_retry_waits_for_conflicting_operation(sleeps):
+    waits = []
+    begin = _begin_operation(_conflict(), "deployed")
+
+    assert begin_with_retry(begin, wait_if_conflict=lambda: waits.append(1)) == "deployed"
+    assert waits == [1]
+    assert sleeps == [0]
+
+
+def test_begin_with_retry_gives_up_after_max_retries(sleeps):
+    begin = _begin_operation(_conflict(), _conflict(), _conflict())
+
+    with pytest.raises(ResourceExistsError):
+        begin_with_retry(begin, max_retries=3, initial_delay=1)
+    assert len(begin.calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_begin_with_retry_does_not_retry_other_errors(sleeps):
+    begin = _begin_operation(ResourceExistsError("Endpoint name is already taken"), "deployed")
+
+    with pytest.raises(ResourceExistsError):
+        begin_with_retry(begin)
+    assert len(begin.calls) == 1
+    assert sleeps == []
+
+
+class _EndpointOperations:
+    def __init__(self, *states):
+        self._states = list(states)
+
+    def get(self, name):
+        state = self._states.pop(0)
+        if isinstance(state, Exception):
+            raise state
+        return SimpleNamespace(provisioning_state=state)
+
+
+def test_wait_for_endpoint_ready_polls_with_backoff(sleeps):
+    operations = _EndpointOperations("Creating", "Updating", "Succeeded")
+
+    assert wait_for_endpoint_ready(operations, "endpoint", initial_delay=2, backoff=1.5)
+    assert sleeps == [2, 3]
+
+
+def test_wait_for_endpoint_ready_when_endpoint_missing(sleeps):
+    operations = _EndpointOperations(ResourceNotFoundError("Endpoint not found"))
+
+    assert wait_for_endpoint_ready(operations, "endpoint")
+    assert sleeps == []
+
+
+def test_wait_for_endpoint_ready_raises_for_failed_endpoint(sleeps):
+    operations = _EndpointOperations("Failed")
+
+    with pytest.raises(Exception, match="Failed"):
+        wait_for_endpoint_ready(operations, "endpoint")
+
+
+def test_wait_for_endpoint_ready_times_out(monkeypatch, sleeps):
+    clock = iter(range(0, 1000, 100))
+    monkeypatch.setattr(endpoint_utils.time, "time", lambda: next(clock))
+    operations = _EndpointOperations(*["Creating"] * 10)
+
+    with pytest.raises(TimeoutError):
+        wait_for_endpoint_ready(operations, "endpoint", max_wait=250)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.london_src.train.train import _fit_linear_regression
+
+
+@pytest.fixture
+def training_data():
+    rng = np.random.default_rng(42)
+    rows = 500
+    train_x = pd.DataFrame(
+        {
+            "distance": rng.uniform(0.5, 20, rows),
+            "passengers": rng.integers(1, 6, rows),
+            "pickup_hour": rng.integers(0, 24, rows),
+            # A single month in the training data gives a constant column
+            "pickup_month": np.full(rows, 6),
+        }
+    )
+    trainy = pd.Series(
+        3.0 + 2.5 * train_x["distance"] + 0.3 * train_x["pickup_hour"] + rng.normal(0, 0.5, rows)
+    )
+    return train_x, trainy
+
+
+def test_fit_linear_regression_matches_sklearn(training_data):
+    train_x, trainy = training_data
+
+    model = _fit_linear_regression(train_x, trainy)
+    expected = LinearRegression().fit(train_x, trainy)
+
+    np.testing.assert_allclose(model.coef_, expected.coef_, atol=1e-4)
+    assert model.intercept_ == pytest.approx(expected.intercept_, abs=1e-3)
+
+
+def test_fit_linear_regression_ignores_constant_feature(training_data):
+    train_x, trainy = training_data
+
+    model = _fit_linear_regression(train_x, trainy)
+
+    assert model.coef_[list(train_x.columns).index("pickup_month")] == pytest.approx(0, abs=1e-4)
+    # A month that was not seen in training must not shift the predictions
+    shifted_x = train_x.assign(pickup_month=7)
+    np.testing.assert_allclose(model.predict(shifted_x), model.predict(train_x), atol=1e-3)